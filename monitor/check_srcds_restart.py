@@ -4,21 +4,31 @@
 #  - Direct (user unit): python3 check_srcds_restart.py --server-host 127.0.0.1 --port 27015 --systemd-unit my-server@instance.service --unit-scope user
 #  - Direct (system unit): python3 check_srcds_restart.py --server-host 127.0.0.1 --port 27015 --systemd-unit my-server.service --unit-scope system
 #
-# Requirements: pip install a2s
+# Requirements: none besides the Python standard library, the A2S server info query is implemented inline.
 # Optional (recommended for D-Bus control): ensure python-dbus is installed (e.g. python3-dbus package).
-# If the dbus Python bindings are not available, the script will fall back to systemctl.
+# If the dbus Python bindings are not available, the pure-Python jeepney D-Bus client is used if installed
+# (pip install jeepney), and the script only falls back to spawning systemctl if neither is present.
+# Optional: with PyGObject installed (e.g. python3-gobject package), unit state changes are awaited
+# via D-Bus signals instead of polling.
 
 import argparse
+import io
+import math
 import os
+import random
 import time
+import shutil
 import subprocess
-import a2s
 import sys
-import bisect
 import socket
-from datetime import datetime
+import struct
+from collections import deque
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple, Any
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Tuple, TypeVar
+
+
+T = TypeVar("T")
 
 
 class UnitScope(Enum):
@@ -26,11 +36,103 @@ class UnitScope(Enum):
     SYSTEM = "system"
 
 
+class ActiveState(Enum):
+    ACTIVE = "active"
+    RELOADING = "reloading"
+    INACTIVE = "inactive"
+    FAILED = "failed"
+    ACTIVATING = "activating"
+    DEACTIVATING = "deactivating"
+    MAINTENANCE = "maintenance"
+    REFRESHING = "refreshing"
+
+
 class RestartFailed(Exception):
     """Raised when a restart attempt failed (non-zero exit or execution error)."""
 
 
-def _have_dbus() -> bool:
+class QueryFailed(Exception):
+    """Raised when the server sent an unexpected or malformed A2S reply."""
+
+
+class ServerInfo(NamedTuple):
+    """The parts of an A2S_INFO reply used by the monitor."""
+    server_name: str
+    map_name: str
+    player_count: int
+    max_players: int
+
+
+# A2S_INFO request, see https://developer.valvesoftware.com/wiki/Server_queries#A2S_INFO
+_A2S_INFO_QUERY = b"\xff\xff\xff\xffTSource Engine Query\x00"
+_A2S_SIMPLE_HEADER = b"\xff\xff\xff\xff"
+_A2S_CHALLENGE_RESPONSE = 0x41
+_A2S_INFO_RESPONSE = 0x49
+# Kernel receive buffer of the query socket, info replies are a single small datagram
+_A2S_RCVBUF = 65536
+
+
+def _parse_a2s_info(data: bytes) -> ServerInfo:
+    """Parse an A2S_INFO reply into a ServerInfo."""
+    if len(data) < 6 or not data.startswith(
+            _A2S_SIMPLE_HEADER) or data[4] != _A2S_INFO_RESPONSE:
+        raise QueryFailed(f"unexpected A2S_INFO reply header {data[:5]!r}")
+    # Header and protocol version are followed by name, map, folder and game as C strings
+    offset = 6
+    strings = []
+    for _ in range(4):
+        end = data.find(b"\x00", offset)
+        if end < 0:
+            raise QueryFailed("truncated A2S_INFO reply")
+        strings.append(data[offset:end].decode("utf-8", errors="replace"))
+        offset = end + 1
+    try:
+        _, player_count, max_players = struct.unpack_from("<HBB", data, offset)
+    except struct.error:
+        raise QueryFailed("truncated A2S_INFO reply")
+    return ServerInfo(server_name=strings[0],
+                      map_name=strings[1],
+                      player_count=player_count,
+                      max_players=max_players)
+
+
+def _a2s_discard_pending(sock: socket.socket) -> None:
+    """Drop datagrams left over on sock, e.g. late replies to an earlier, timed out query."""
+    sock.setblocking(False)
+    while True:
+        try:
+            sock.recv(_A2S_RCVBUF)
+        except BlockingIOError:
+            return
+        except ConnectionRefusedError:
+            # Stale ICMP error of an earlier datagram, the query itself reports a current one
+            continue
+
+
+def _a2s_receive(sock: socket.socket, deadline: float) -> bytes:
+    """Receive the next datagram, raising TimeoutError after deadline (monotonic)."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("timed out")
+    sock.settimeout(remaining)
+    return sock.recv(_A2S_RCVBUF)
+
+
+def a2s_info(sock: socket.socket, timeout: float) -> ServerInfo:
+    """Query the server info via A2S_INFO, reusing the UDP socket sock connected to the server."""
+    _a2s_discard_pending(sock)
+    deadline = time.monotonic() + timeout
+    sock.send(_A2S_INFO_QUERY)
+    data = _a2s_receive(sock, deadline)
+    if len(data) >= 9 and data.startswith(
+            _A2S_SIMPLE_HEADER) and data[4] == _A2S_CHALLENGE_RESPONSE:
+        # Newer servers require repeating the query with the challenge number appended
+        sock.send(_A2S_INFO_QUERY + data[5:9])
+        data = _a2s_receive(sock, deadline)
+    return _parse_a2s_info(data)
+
+
+def _probe_dbus() -> bool:
     """Return True if python-dbus is available."""
     try:
         import dbus  # type: ignore
@@ -39,215 +141,571 @@ def _have_dbus() -> bool:
     return True
 
 
+# Evaluated once at import; the bindings can't appear or vanish at runtime
+_HAVE_DBUS: bool = _probe_dbus()
+if _HAVE_DBUS:
+    # Bound at module level, as it's used on every D-Bus call
+    import dbus
+
+
+def _probe_glib() -> bool:
+    """Return True if the GLib main loop and its python-dbus integration are available."""
+    try:
+        import dbus.mainloop.glib  # type: ignore
+        from gi.repository import GLib  # type: ignore
+    except Exception as e:
+        return False
+    return True
+
+
+_HAVE_GLIB: bool = _HAVE_DBUS and _probe_glib()
+if _HAVE_GLIB:
+    import dbus.mainloop.glib
+    from gi.repository import GLib
+
+
+def _probe_jeepney() -> bool:
+    """Return True if the jeepney D-Bus client is available."""
+    try:
+        import jeepney  # type: ignore
+        import jeepney.io.blocking  # type: ignore
+    except Exception as e:
+        return False
+    return True
+
+
+# jeepney is only used as a fallback, so don't bother importing it otherwise
+_HAVE_JEEPNEY: bool = not _HAVE_DBUS and _probe_jeepney()
+if _HAVE_JEEPNEY:
+    # Bound at module level, as without signals jeepney is used on every check
+    from jeepney import (DBusAddress, DBusErrorResponse, Properties,
+                         new_method_call)
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg  # type: ignore
+
+    # Address of the systemd Manager, which never changes
+    _JEEPNEY_MANAGER = DBusAddress("/org/freedesktop/systemd1",
+                                   bus_name="org.freedesktop.systemd1",
+                                   interface="org.freedesktop.systemd1.Manager")
+
+# How the unit is controlled, in order of preference; spawning systemctl is the last resort
+if _HAVE_DBUS:
+    _UNIT_CONTROL = "D-Bus (python-dbus)"
+elif _HAVE_JEEPNEY:
+    _UNIT_CONTROL = "D-Bus (jeepney)"
+else:
+    _UNIT_CONTROL = "systemctl"
+
+# Absolute path of systemctl, subprocess can only use posix_spawn instead of fork+exec given a path
+_SYSTEMCTL: str = shutil.which("systemctl") or "systemctl"
+
+# ActiveState values the unit passes through on its way to a stable state
+_TRANSITIONAL_STATES = frozenset({
+    ActiveState.ACTIVATING, ActiveState.DEACTIVATING, ActiveState.RELOADING,
+    ActiveState.REFRESHING
+})
+
+# While the server is healthy and empty, the check interval grows by this factor per check...
+_IDLE_INTERVAL_GROWTH = 1.5
+# ...up to this multiple of the configured interval
+_IDLE_INTERVAL_MAX_FACTOR = 5
+# While the server is starting up, the first check comes after this fraction of the interval,
+# each further one after twice the previous wait up to the configured interval
+_STARTUP_INTERVAL_DIVISOR = 4
+# Each wait is randomly stretched or shrunk by up to this fraction,
+# so that monitors started together don't keep hitting D-Bus at the same time
+_INTERVAL_JITTER = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class MonitorConfig:
+    """Configuration of a SRCDS monitor, validated on construction."""
+    server_host: str
+    port: int
+    systemd_unit: str
+    interval: float
+    timeout: float
+    failure_threshold: int
+    restart_cooldown: float
+    max_restarts_per_hour: int
+    unit_scope: UnitScope
+
+    def __post_init__(self) -> None:
+        """Coerce and validate configuration parameters and raise ValueError on invalid input."""
+        if not self.server_host:
+            raise ValueError("server_host must be provided and non-empty")
+        if not self.systemd_unit:
+            raise ValueError("systemd_unit must be provided and non-empty")
+
+        # Coerce the numbers once here, so that only their ranges need checking
+        numbers: Tuple[Tuple[str, Callable[[Any], Any], Callable[[Any], bool],
+                             str], ...] = (
+            ("port", int, lambda v: 1 <= v <= 65535,
+             "port must be an integer in range 1..65535"),
+            ("interval", float, lambda v: 0 < v < math.inf,
+             "interval must be a positive finite number (seconds)"),
+            ("timeout", float, lambda v: 0 < v < math.inf,
+             "timeout must be a positive finite number (seconds)"),
+            ("failure_threshold", int, lambda v: v >= 1,
+             "failure_threshold must be an integer >= 1"),
+            ("restart_cooldown", float, lambda v: 0 <= v < math.inf,
+             "restart_cooldown must be a non-negative finite number (seconds)"),
+            ("max_restarts_per_hour", int, lambda v: v >= 0,
+             "max_restarts_per_hour must be an integer >= 0 (0 means unlimited)"
+             ),
+        )
+        for name, kind, in_range, message in numbers:
+            raw = getattr(self, name)
+            try:
+                value = kind(raw)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(message) from None
+            # int() parses strings exactly but truncates other numbers, which mustn't pass silently
+            if kind is int and not isinstance(raw, str) and value != raw:
+                raise ValueError(message)
+            if not in_range(value):
+                raise ValueError(message)
+            object.__setattr__(self, name, value)
+
+        try:
+            object.__setattr__(self, "unit_scope", UnitScope(self.unit_scope))
+        except ValueError:
+            raise ValueError(
+                "unit_scope must be a UnitScope enum value") from None
+
+
 class Monitor:
     """SRCDS monitor class."""
 
-    def __init__(
-        self,
-        server_host: str,
-        port: int,
-        systemd_unit: str,
-        interval: float,
-        timeout: float,
-        failure_threshold: int,
-        restart_cooldown: float,
-        max_restarts_per_hour: int,
-        unit_scope: UnitScope,
-    ):
-        """Initialise the SRCDS monitor."""
-        self.server_host = server_host
-        self.port = port
-        self.systemd_unit = systemd_unit
-        self.interval = interval
-        self.timeout = timeout
-        self.failure_threshold = failure_threshold
-        self.restart_cooldown = restart_cooldown
-        self.max_restarts_per_hour = max_restarts_per_hour
-        self.unit_scope = unit_scope
-
-        # Validate parameters (prevent negatives / invalid values)
-        self._validate_params()
+    # Fixed attribute layout, avoids a per-instance __dict__
+    __slots__ = (
+        "config",
+        "server_host",
+        "port",
+        "systemd_unit",
+        "interval",
+        "timeout",
+        "failure_threshold",
+        "restart_cooldown",
+        "_restart_cooldown_ns",
+        "max_restarts_per_hour",
+        "unit_scope",
+        "_consecutive_failures",
+        "_restart_timestamps_monotonic",
+        "_proc_responded_after_start",
+        "_current_interval",
+        "_startup_polls",
+        "_server_addr",
+        "_a2s_sock",
+        "_bus",
+        "_manager_iface",
+        "_unit_obj",
+        "_props_iface",
+        "_cached_active_state",
+        "_active_state_dirty",
+        "_signal_matches",
+        "_jeepney_conn",
+        "_jeepney_unit",
+    )
+
+    def __init__(self, config: MonitorConfig) -> None:
+        """Initialise the SRCDS monitor from an already validated configuration."""
+        self.config = config
+        # Copied to plain attributes as they are read on every check
+        self.server_host = config.server_host
+        self.port = config.port
+        self.systemd_unit = config.systemd_unit
+        self.interval = config.interval
+        self.timeout = config.timeout
+        self.failure_threshold = config.failure_threshold
+        self.restart_cooldown = config.restart_cooldown
+        self._restart_cooldown_ns = int(config.restart_cooldown * 1e9)
+        self.max_restarts_per_hour = config.max_restarts_per_hour
+        self.unit_scope = config.unit_scope
 
         # per-monitor private state
         self._consecutive_failures = 0
-        # monotonic timestamps of restart/start attempts (sorted ascending)
-        self._restart_timestamps_monotonic: List[float] = []
+        # monotonic timestamps in integer nanoseconds of restart/start attempts (sorted ascending)
+        # The rate limit only ever needs the newest max_restarts_per_hour entries, so cap the deque there
+        self._restart_timestamps_monotonic: Deque[int] = deque(
+            maxlen=self.max_restarts_per_hour or None)
         # flag remembering whether the currently started process ever responded
         # this is used to ensure the server isn't still busy starting, for example downloading Workshop content
         self._proc_responded_after_start = False
+        # seconds until the next check, backs off from interval while the server is idle
+        self._current_interval = self.interval
+        # number of checks since the process was (re)started that it didn't respond to yet
+        self._startup_polls = 0
+        # resolved (ip, port) of the server, cached so that A2S queries don't resolve the host every time
+        self._server_addr: Tuple[str, int] | None = None
+        # UDP socket reused for all A2S queries (see _get_a2s_socket)
+        self._a2s_sock: socket.socket | None = None
+        # D-Bus handles, acquired lazily and kept across checks (see _ensure_dbus)
+        self._bus: Any = None
+        self._manager_iface: Any = None
+        self._unit_obj: Any = None
+        self._props_iface: Any = None
+        # ActiveState as last read or reported by PropertiesChanged signals,
+        # only valid while _active_state_dirty is False
+        self._cached_active_state = ActiveState.INACTIVE
+        self._active_state_dirty = True
+        self._signal_matches: List[Any] = []
+        # jeepney connection and unit address, used if python-dbus is unavailable (see _ensure_jeepney)
+        self._jeepney_conn: Any = None
+        self._jeepney_unit: Any = None
 
-    def _validate_params(self) -> None:
-        """Validate configuration parameters and raise ValueError on invalid input."""
-        if not self.server_host:
-            raise ValueError("server_host must be provided and non-empty")
-        if not isinstance(self.port, int) or not (1 <= self.port <= 65535):
-            raise ValueError("port must be an integer in range 1..65535")
-        if not isinstance(self.interval, (int, float)) or self.interval <= 0:
-            raise ValueError("interval must be a positive number (seconds)")
-        if not isinstance(self.timeout, (int, float)) or self.timeout <= 0:
-            raise ValueError("timeout must be a positive number (seconds)")
-        if not isinstance(self.failure_threshold,
-                          int) or self.failure_threshold < 1:
-            raise ValueError("failure_threshold must be an integer >= 1")
-        if not isinstance(self.restart_cooldown,
-                          (int, float)) or self.restart_cooldown < 0:
-            raise ValueError(
-                "restart_cooldown must be a non-negative number (seconds)")
-        if not isinstance(self.max_restarts_per_hour,
-                          int) or self.max_restarts_per_hour < 0:
-            raise ValueError(
-                "max_restarts_per_hour must be an integer >= 0 (0 means unlimited)"
-            )
-        if not self.systemd_unit:
-            raise ValueError("systemd_unit must be provided and non-empty")
-        if not isinstance(self.unit_scope, UnitScope):
-            raise ValueError("unit_scope must be a UnitScope enum value")
-
-    def _log(self, *parts) -> None:
+    def _log(self, *parts: object) -> None:
         """Log with local timezone-aware ISO timestamp prefixed."""
-        ts = datetime.now().astimezone().isoformat()
-        print(ts, *parts, flush=True)
+        # time.localtime() carries the UTC offset, so no datetime objects need to be created
+        # The offset isn't cached as it changes with daylight saving time
+        ts = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        ts = ts[:-2] + ":" + ts[-2:]
+        # Join the line up front so that it's written out with a single write call
+        # stdout is line buffered (see main), so the newline flushes it
+        sys.stdout.write(ts + " " + " ".join(map(str, parts)) + "\n")
 
     # --- D-Bus helpers --- #
     def _get_dbus_bus(self) -> Any:
         """Return the appropriate bus instance based on unit_scope."""
-        import dbus
         bus = dbus.SessionBus(
         ) if self.unit_scope == UnitScope.USER else dbus.SystemBus()
         return bus
 
-    def _get_systemd_manager(self) -> Any:
-        """Return the appropriate systemd Manager instance based on unit_scope."""
+    def _ensure_dbus(self) -> None:
+        """Acquire the bus, systemd Manager and Unit handles unless already cached."""
+        if self._props_iface is not None:
+            return
+        if _HAVE_GLIB:
+            # Signals are dispatched through the GLib main loop, this has to be set before acquiring the bus
+            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+        bus = self._get_dbus_bus()
+        systemd_obj = bus.get_object("org.freedesktop.systemd1",
+                                     "/org/freedesktop/systemd1")
+        manager_iface = dbus.Interface(systemd_obj,
+                                       "org.freedesktop.systemd1.Manager")
+        if _HAVE_GLIB:
+            # systemd only emits signals once at least one client subscribed
+            try:
+                manager_iface.Subscribe()
+            except dbus.DBusException as e:
+                if e.get_dbus_name(
+                ) != "org.freedesktop.systemd1.AlreadySubscribed":
+                    raise
+        unit_path = manager_iface.GetUnit(self.systemd_unit)
+        unit_obj = bus.get_object("org.freedesktop.systemd1", unit_path)
+        props_iface = dbus.Interface(unit_obj,
+                                     "org.freedesktop.DBus.Properties")
+        if _HAVE_GLIB:
+            # Track the unit state as systemd reports its changes
+            self._signal_matches.append(
+                unit_obj.connect_to_signal(
+                    "PropertiesChanged",
+                    self._on_unit_properties_changed,
+                    dbus_interface="org.freedesktop.DBus.Properties"))
+            # After the unit was (re)loaded or the manager reloaded, read the state again
+            for signal_name in ("UnitNew", "UnitRemoved"):
+                self._signal_matches.append(
+                    manager_iface.connect_to_signal(
+                        signal_name, self._on_unit_loaded_or_removed))
+            self._signal_matches.append(
+                manager_iface.connect_to_signal("Reloading",
+                                                self._on_manager_reloading))
+        self._bus = bus
+        self._manager_iface = manager_iface
+        self._unit_obj = unit_obj
+        self._props_iface = props_iface
+
+    def _reset_dbus(self) -> None:
+        """Drop the cached D-Bus handles so that they are re-acquired on next use."""
+        for signal_match in self._signal_matches:
+            try:
+                signal_match.remove()
+            except Exception:
+                # The connection may already be gone
+                pass
+        self._signal_matches = []
+        self._active_state_dirty = True
+        self._bus = None
+        self._manager_iface = None
+        self._unit_obj = None
+        self._props_iface = None
+
+    def _on_unit_properties_changed(self, interface: str,
+                                    changed: Dict[str, Any],
+                                    invalidated: List[str]) -> None:
+        """Update the cached unit state from a PropertiesChanged signal."""
+        if interface != "org.freedesktop.systemd1.Unit" or "ActiveState" not in changed:
+            return
         try:
-            import dbus
-            bus = self._get_dbus_bus()
-            systemd_obj = bus.get_object("org.freedesktop.systemd1",
-                                         "/org/freedesktop/systemd1")
-            return dbus.Interface(systemd_obj,
-                                  "org.freedesktop.systemd1.Manager")
-        except Exception as e:
-            raise RestartFailed(
-                f"Error acquiring systemd Manager via D-Bus: {e}")
+            self._cached_active_state = ActiveState(str(
+                changed["ActiveState"]))
+            self._active_state_dirty = False
+        except ValueError:
+            # Let the next explicit read report the unknown state
+            self._active_state_dirty = True
+
+    def _on_unit_loaded_or_removed(self, unit_id: str, unit_path: str) -> None:
+        """Invalidate the cached unit state if systemd loaded or unloaded the unit."""
+        if unit_id == self.systemd_unit:
+            self._active_state_dirty = True
 
-    def _get_systemd_unit(self) -> Any:
-        """Return the appropriate systemd Unit instance based on unit_scope."""
+    def _on_manager_reloading(self, active: bool) -> None:
+        """Invalidate the cached unit state when systemd reloads its configuration."""
+        self._active_state_dirty = True
+
+    def _dispatch_pending_signals(self) -> None:
+        """Run the handlers of all D-Bus signals received since the last dispatch."""
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+
+    def _call_dbus(self, func: Callable[[], T]) -> T:
+        """Call func with the cached D-Bus handles, re-acquiring them once on a D-Bus error."""
         try:
-            bus = self._get_dbus_bus()
-            manager = self._get_systemd_manager()
-            unit_path = manager.GetUnit(self.systemd_unit)
-            return bus.get_object("org.freedesktop.systemd1", unit_path)
-        except Exception as e:
-            raise RestartFailed(f"Error acquiring systemd Unit via D-Bus: {e}")
+            self._ensure_dbus()
+            return func()
+        except dbus.DBusException:
+            # The handles may be stale (e.g. the unit was reloaded), retry once with fresh ones
+            self._reset_dbus()
+            self._ensure_dbus()
+            return func()
+
+    # --- jeepney helpers --- #
+    def _ensure_jeepney(self) -> None:
+        """Open the jeepney connection and resolve the unit address unless already cached."""
+        if self._jeepney_unit is not None:
+            return
+        conn = open_dbus_connection(
+            bus="SESSION" if self.unit_scope == UnitScope.USER else "SYSTEM")
+        try:
+            unit_path = self._jeepney_call(
+                conn,
+                new_method_call(_JEEPNEY_MANAGER, "GetUnit", "s",
+                                (self.systemd_unit, )))[0]
+        except Exception:
+            conn.close()
+            raise
+        self._jeepney_conn = conn
+        self._jeepney_unit = DBusAddress(unit_path,
+                                         bus_name="org.freedesktop.systemd1",
+                                         interface="org.freedesktop.systemd1.Unit")
+
+    def _reset_jeepney(self) -> None:
+        """Close the jeepney connection so that it is re-opened on next use."""
+        if self._jeepney_conn is not None:
+            try:
+                self._jeepney_conn.close()
+            except OSError:
+                pass
+        self._jeepney_conn = None
+        self._jeepney_unit = None
+
+    @staticmethod
+    def _jeepney_call(conn: Any, msg: Any) -> Tuple[Any, ...]:
+        """Send msg over conn and return the reply body, raising DBusErrorResponse on error replies."""
+        body: Tuple[Any, ...] = unwrap_msg(conn.send_and_get_reply(msg))
+        return body
+
+    def _call_jeepney(self, func: Callable[[], T]) -> T:
+        """Call func with the cached jeepney connection, re-opening it once on an error."""
+        try:
+            self._ensure_jeepney()
+            return func()
+        except (DBusErrorResponse, OSError):
+            self._reset_jeepney()
+            self._ensure_jeepney()
+            return func()
 
-    # --- Unit properties via D-Bus and systemctl --- #
-    def _unit_properties_via_dbus(self, properties: List[str]) -> dict:
+    # --- systemctl helpers --- #
+    def _run_systemctl(self,
+                       args: List[str],
+                       timeout: float | None = None
+                       ) -> subprocess.CompletedProcess[str]:
+        """Run systemctl with args for the configured unit scope and capture its output."""
+        cmd = [_SYSTEMCTL]
+        if self.unit_scope == UnitScope.USER:
+            cmd += ["--user"]
+        cmd += args
+        # Keeping close_fds off lets subprocess use posix_spawn rather than fork+exec.
+        # This is safe as Python creates its file descriptors non-inheritable.
+        return subprocess.run(cmd,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              text=True,
+                              check=False,
+                              close_fds=False,
+                              timeout=timeout)
+
+    # --- Unit properties via python-dbus, jeepney and systemctl --- #
+    def _unit_properties_via_dbus(self, properties: List[str]) -> Dict[str, Any]:
         """Return a dictionary of properties of the systemd Unit via DBus."""
         if len(properties) == 0:
             # We can fast fail in this case, as this can only happen in case of a serious bug
             print("Error: Program requested an empty list of properties",
                   file=sys.stderr)
             sys.exit(1)
+
+        def query() -> Dict[str, Any]:
+            # A single GetAll round-trip is cheaper than one Get per property
+            all_props = self._props_iface.GetAll(
+                "org.freedesktop.systemd1.Unit")
+            return {prop: all_props[prop] for prop in properties}
+
         try:
-            import dbus
-            unit_obj = self._get_systemd_unit()
-            props_iface = dbus.Interface(unit_obj,
-                                         "org.freedesktop.DBus.Properties")
-            props_values = {}
-            for prop in properties:
-                props_values[prop] = props_iface.Get(
-                    "org.freedesktop.systemd1.Unit", prop)
-            return props_values
+            return self._call_dbus(query)
         except Exception as e:
             raise RestartFailed(f"Error querying properties via D-Bus: {e}")
 
-    def _unit_properties_via_systemctl(self, properties: List[str]) -> dict:
+    def _unit_properties_via_jeepney(self, properties: List[str]) -> Dict[str, Any]:
+        """Return a dictionary of properties of the systemd Unit via jeepney."""
+        if len(properties) == 0:
+            # We can fast fail in this case, as this can only happen in case of a serious bug
+            print("Error: Program requested an empty list of properties",
+                  file=sys.stderr)
+            sys.exit(1)
+
+        def query() -> Dict[str, Any]:
+            all_props = self._jeepney_call(
+                self._jeepney_conn,
+                Properties(self._jeepney_unit).get_all())[0]
+            # Values are returned as (signature, value) variants
+            return {prop: all_props[prop][1] for prop in properties}
+
+        try:
+            return self._call_jeepney(query)
+        except Exception as e:
+            raise RestartFailed(f"Error querying properties via jeepney: {e}")
+
+    def _unit_properties_via_systemctl(self, properties: List[str]) -> Dict[str, Any]:
         """Return a dictionary of properties of the systemd Unit via systemctl."""
         if len(properties) == 0:
             # We can fast fail in this case, as this can only happen in case of a serious bug
             print("Error: Program requested an empty list of properties",
                   file=sys.stderr)
             sys.exit(1)
-        cmd_base = ["systemctl"]
-        if self.unit_scope == UnitScope.USER:
-            cmd_base += ["--user"]
-        cmd_base += ["show", "-p"]
-        props_values = {}
+        args = ["show"]
+        # systemctl accepts -p multiple times, so all properties are queried with a single invocation
         for prop in properties:
-            cmd = cmd_base + [prop, self.systemd_unit]
-            proc = subprocess.run(cmd,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE)
-            if proc.returncode != 0:
-                raise RestartFailed(
-                    proc.stderr.strip() or
-                    f"Error checking unit state via systemctl: {proc.returncode}"
-                )
-            props_values[prop] = proc.stdout.strip()
+            args += ["-p", prop]
+        args += [self.systemd_unit]
+        proc = self._run_systemctl(args)
+        if proc.returncode != 0:
+            raise RestartFailed(
+                proc.stderr.strip() or
+                f"Error checking unit state via systemctl: {proc.returncode}")
+
+        # The output consists of one "Property=value" line per requested property
+        props_values: Dict[str, Any] = {}
+        for line in proc.stdout.splitlines():
+            prop, sep, value = line.partition("=")
+            if sep and prop in properties:
+                props_values[prop] = value
+        missing = [prop for prop in properties if prop not in props_values]
+        if missing:
+            raise RestartFailed(
+                f"systemctl did not report properties: {', '.join(missing)}")
         return props_values
 
-    def get_unit_properties(self, properties: List[str]) -> dict:
-        """Retrieve unit properties using D-Bus if possible, otherwise fallback to systemctl."""
-        if _have_dbus():
+    def get_unit_properties(self, properties: List[str]) -> Dict[str, Any]:
+        """Retrieve unit properties via python-dbus, else via jeepney, else via systemctl."""
+        if _HAVE_DBUS:
             return self._unit_properties_via_dbus(properties)
+        elif _HAVE_JEEPNEY:
+            return self._unit_properties_via_jeepney(properties)
         else:
             return self._unit_properties_via_systemctl(properties)
 
-    def get_unit_state(self) -> str:
-        """Determine the unit state using D-Bus if possible, otherwise fallback to systemctl."""
-        return self.get_unit_properties(["ActiveState"])["ActiveState"]
+    def _read_unit_state(self) -> ActiveState:
+        """Read the unit state through the backend chosen by get_unit_properties."""
+        # Convert right away, so comparisons don't go through the D-Bus string wrapper
+        raw_state = str(self.get_unit_properties(["ActiveState"])["ActiveState"])
+        try:
+            return ActiveState(raw_state)
+        except ValueError:
+            raise RuntimeError(f"unit is in unknown state {raw_state}")
+
+    def get_unit_state(self) -> ActiveState:
+        """Determine the unit state, reading it only if no signal reported it yet."""
+        if not _HAVE_GLIB:
+            return self._read_unit_state()
+        self._dispatch_pending_signals()
+        if self._active_state_dirty:
+            # Any later change is delivered as a signal and overrides this
+            self._cached_active_state = self._read_unit_state()
+            self._active_state_dirty = False
+        return self._cached_active_state
 
-    # --- Restart via D-Bus and systemctl --- #
+    # --- Restart via python-dbus, jeepney and systemctl --- #
     def _restart_unit_via_dbus(self) -> None:
         """Restart unit using D-Bus RestartUnit."""
         try:
-            manager = self._get_systemd_manager()
-            manager.RestartUnit(self.systemd_unit, "replace")
+            self._call_dbus(lambda: self._manager_iface.RestartUnit(
+                self.systemd_unit, "replace"))
         except Exception as e:
-            raise RestartFailed(f"Error starting unit via D-Bus: {e}")
+            raise RestartFailed(f"Error restarting unit via D-Bus: {e}")
 
-    def _restart_unit_via_systemctl(self) -> None:
-        """Fallback to systemctl start; raise RestartFailed on error."""
-        cmd = ["systemctl"]
-        if self.unit_scope == UnitScope.USER:
-            cmd += ["--user"]
-        cmd += ["restart", self.systemd_unit]
+    def _restart_unit_via_jeepney(self) -> None:
+        """Restart unit using RestartUnit via jeepney."""
+        try:
+            self._call_jeepney(lambda: self._jeepney_call(
+                self._jeepney_conn,
+                new_method_call(_JEEPNEY_MANAGER, "RestartUnit", "ss",
+                                (self.systemd_unit, "replace"))))
+        except Exception as e:
+            raise RestartFailed(f"Error restarting unit via jeepney: {e}")
 
-        proc = subprocess.run(cmd,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              text=True,
-                              check=False,
-                              timeout=30)
+    def _restart_unit_via_systemctl(self) -> None:
+        """Restart unit using systemctl restart; raise RestartFailed on error."""
+        proc = self._run_systemctl(["restart", self.systemd_unit], timeout=30)
         if proc.returncode != 0:
             raise RestartFailed(
                 proc.stderr.strip()
                 or f"Error restarting unit via systemctl: {proc.returncode}")
 
     def _restart_unit(self) -> None:
-        """Start the unit via D-Bus if available, or via systemctl otherwise.
+        """Restart the unit via python-dbus, else via jeepney, else via systemctl.
 
-        On success appends a monotonic timestamp and resets consecutive failures.
+        Appends a monotonic timestamp for the attempt and on success resets consecutive failures.
         """
         # In debug, ensure that this is not called if it wasn't allowed
         assert self.is_restart_allowed()[0]
 
-        if _have_dbus():
+        # Record exactly one timestamp per attempt, whether or not it succeeds,
+        # so that failing restarts are subject to the cooldown and rate limit as well
+        self._restart_timestamps_monotonic.append(time.monotonic_ns())
+
+        if _HAVE_DBUS:
             self._restart_unit_via_dbus()
+        elif _HAVE_JEEPNEY:
+            self._restart_unit_via_jeepney()
         else:
             self._restart_unit_via_systemctl()
 
-        # Success: record a single timestamp and reset failures
-        self._restart_timestamps_monotonic.append(time.monotonic())
+        # Success: reset failures
         self._consecutive_failures = 0
         self._proc_responded_after_start = False
+        # and check back soon, the server tends to come up any moment now
+        self._startup_polls = 0
+        self._back_off_startup_interval()
+
+    def _back_off_startup_interval(self) -> None:
+        """Set the wait until the next check of a server that's still starting up.
+
+        Starts at a fraction of the interval and doubles per unanswered check up to the interval.
+        """
+        self._current_interval = min(
+            self.interval, self.interval / _STARTUP_INTERVAL_DIVISOR *
+            2**self._startup_polls)
+        if self._current_interval < self.interval:
+            self._startup_polls += 1
 
     def prune_restart_timestamps(self) -> None:
         """Prune timestamps eliminating those not within the last hour for rate limiting."""
-        cutoff = time.monotonic() - 3600.0
-        idx = bisect.bisect_left(self._restart_timestamps_monotonic, cutoff)
-        if idx:
-            self._restart_timestamps_monotonic[:] = self._restart_timestamps_monotonic[
-                idx:]
+        cutoff = time.monotonic_ns() - 3_600_000_000_000
+        # Timestamps are appended in ascending order, so expired ones are always at the front
+        while self._restart_timestamps_monotonic and self._restart_timestamps_monotonic[
+                0] < cutoff:
+            self._restart_timestamps_monotonic.popleft()
 
     def is_restart_allowed(self) -> Tuple[bool, str]:
         """Return (True, reason) if allowed to restart now, otherwise (False, reason)."""
@@ -256,23 +714,23 @@ class Monitor:
         # Disallow restarts during the pre-start stage
         active_state = self.get_unit_state()
         match active_state:
-            case "failed":
+            case ActiveState.FAILED:
                 return False, "restart forbidden as the unit failed"
-            case "inactive":
+            case ActiveState.INACTIVE:
                 return False, "unit is listed as inactive"
-            case "activating" | "deactivating" | "refreshing" | "reloading":
-                return False, f"unit is in a transitional state {active_state}"
-            case "maintenance":
+            case ActiveState.ACTIVATING | ActiveState.DEACTIVATING | ActiveState.REFRESHING | ActiveState.RELOADING:
+                return False, f"unit is in a transitional state {active_state.value}"
+            case ActiveState.MAINTENANCE:
                 return False, f"unit is in maintenance"
-            case "active":
+            case ActiveState.ACTIVE:
                 if not self._proc_responded_after_start:
                     return False, "current unit process has not responded yet; likely in startup"
 
                 if self._restart_timestamps_monotonic:
-                    elapsed_since_last = time.monotonic(
+                    elapsed_since_last_ns = time.monotonic_ns(
                     ) - self._restart_timestamps_monotonic[-1]
-                    if elapsed_since_last < self.restart_cooldown:
-                        return False, f"cooldown ({int(self.restart_cooldown - elapsed_since_last)}s remaining)"
+                    if elapsed_since_last_ns < self._restart_cooldown_ns:
+                        return False, f"cooldown ({(self._restart_cooldown_ns - elapsed_since_last_ns) // 1_000_000_000}s remaining)"
 
                 # If max_restarts_per_hour is 0, interpret it as "unlimited"
                 if self.max_restarts_per_hour > 0 and len(
@@ -281,8 +739,6 @@ class Monitor:
                     return False, f"rate limit reached ({len(self._restart_timestamps_monotonic)} restarts in last hour)"
 
                 return True, "restart allowed"
-            case _:
-                raise RuntimeError(f"unit is in unknown state {active_state}")
 
     def attempt_restart(self) -> bool:
         """Attempt to restart configured systemd unit.
@@ -293,8 +749,8 @@ class Monitor:
             self._log("Skipping restart:", skip_reason)
             return False
 
-        # Try D-Bus RestartUnit first, fallback to systemctl restart on failure.
-        self._log("Attempting RestartUnit via D-Bus for unit",
+        # The unit is restarted via the backend picked at startup (see _restart_unit)
+        self._log("Attempting restart via", _UNIT_CONTROL, "for unit",
                   self.systemd_unit)
         try:
             self._restart_unit()
@@ -305,55 +761,194 @@ class Monitor:
         self._log("Restart of unit succeeded:", self.systemd_unit)
         return True
 
+    # --- A2S query --- #
+    def _resolve_server_addr(self) -> Tuple[str, int]:
+        """Return the resolved (ip, port) of the server, resolving server_host only once."""
+        if self._server_addr is None:
+            addrinfo = socket.getaddrinfo(self.server_host,
+                                          self.port,
+                                          family=socket.AF_INET,
+                                          type=socket.SOCK_DGRAM)
+            ip, port = addrinfo[0][4][:2]
+            self._server_addr = (str(ip), int(port))
+        return self._server_addr
+
+    def _get_a2s_socket(self) -> socket.socket:
+        """Return the UDP socket used for A2S queries, creating and connecting it on first use."""
+        if self._a2s_sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                # The default buffer is sized for bulk traffic, a few KB are plenty for the replies
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                _A2S_RCVBUF)
+                # Connecting makes the kernel drop datagrams from other senders
+                # and report ICMP errors, so a closed port fails right away instead of timing out
+                sock.connect(self._resolve_server_addr())
+            except Exception:
+                sock.close()
+                raise
+            self._a2s_sock = sock
+        return self._a2s_sock
+
+    def _reset_a2s_socket(self) -> None:
+        """Close the A2S socket and forget the resolved address, so both are renewed on next use."""
+        if self._a2s_sock is not None:
+            self._a2s_sock.close()
+        self._a2s_sock = None
+        self._server_addr = None
+
+    def query_server(self) -> ServerInfo:
+        """Query the SRCDS server info via A2S."""
+        try:
+            return a2s_info(self._get_a2s_socket(), self.timeout)
+        except Exception:
+            # Resolve and connect again on the next query in case the host's address changed
+            # or the socket is in an error state
+            self._reset_a2s_socket()
+            raise
+
+    # --- Waiting for transitional states --- #
+    def _wait_for_settled_state_via_signal(self, active_state: ActiveState,
+                                           timeout: int) -> ActiveState:
+        """Wait for the unit to leave a transitional state using PropertiesChanged signals."""
+        loop = GLib.MainLoop()
+        timed_out = False
+
+        def on_properties_changed(interface: str, changed: Dict[str, Any],
+                                  invalidated: List[str]) -> None:
+            if interface != "org.freedesktop.systemd1.Unit" or "ActiveState" not in changed:
+                return
+            try:
+                settled = ActiveState(str(
+                    changed["ActiveState"])) not in _TRANSITIONAL_STATES
+            except ValueError:
+                # Unknown states are reported by get_unit_state once the loop quit
+                settled = True
+            if settled:
+                loop.quit()
+
+        def on_timeout() -> bool:
+            nonlocal timed_out
+            timed_out = True
+            loop.quit()
+            return False
+
+        try:
+            signal_match = self._call_dbus(
+                lambda: self._unit_obj.connect_to_signal(
+                    "PropertiesChanged",
+                    on_properties_changed,
+                    dbus_interface="org.freedesktop.DBus.Properties"))
+        except Exception as e:
+            raise RestartFailed(
+                f"Error subscribing to unit changes via D-Bus: {e}")
+        timeout_id = GLib.timeout_add_seconds(timeout, on_timeout)
+        try:
+            # The state may have changed before the signal handler was connected
+            active_state = self.get_unit_state()
+            if active_state in _TRANSITIONAL_STATES:
+                loop.run()
+        finally:
+            signal_match.remove()
+            if not timed_out:
+                GLib.source_remove(timeout_id)
+
+        active_state = self.get_unit_state()
+        if timed_out and active_state in _TRANSITIONAL_STATES:
+            raise RuntimeError(
+                f"Unit {self.systemd_unit} has been in state {active_state.value} over {timeout}s"
+            )
+        return active_state
+
+    def _wait_for_settled_state_via_polling(self, active_state: ActiveState,
+                                            timeout: int) -> ActiveState:
+        """Wait for the unit to leave a transitional state by polling its state."""
+        # Quick transitions are noticed right away, longer ones are polled at most every 2s
+        delay = 0.25
+        time_waited = 0.0
+        while active_state in _TRANSITIONAL_STATES:
+            if time_waited >= timeout:
+                raise RuntimeError(
+                    f"Unit {self.systemd_unit} has been in state {active_state.value} over {int(time_waited)}s"
+                )
+            time.sleep(delay)
+            time_waited += delay
+            delay = min(delay * 2, 2.0)
+            active_state = self.get_unit_state()
+        return active_state
+
+    def wait_for_settled_state(self,
+                               active_state: ActiveState,
+                               timeout: int = 300) -> ActiveState:
+        """Wait until the unit left its transitional state and return the new state.
+
+        Raises RuntimeError if the unit is still transitioning after timeout seconds.
+        """
+        if _HAVE_GLIB:
+            return self._wait_for_settled_state_via_signal(
+                active_state, timeout)
+        else:
+            return self._wait_for_settled_state_via_polling(
+                active_state, timeout)
+
     # --- main check loop --- #
 
     def check_server(self) -> None:
         """Ensure the unit is running and then query the SRCDS server (if unit active)."""
+        # Bind what's used on every check to locals to save the attribute lookups
+        log = self._log
+        interval = self.interval
+
         # If the unit is currently in a transitional state, we wait it out
         active_state = self.get_unit_state()
-        time_waited = 0
-        while active_state in [
-                "activating", "deactivating", "reloading", "refreshing"
-        ]:
-            if time_waited >= 300:
-                raise RuntimeError(
-                    f"Unit {self.systemd_unit} has been in state {active_state} over {time_waited}s"
-                )
-            time.sleep(10)
-            time_waited += 10
-            active_state = self.get_unit_state()
+        if active_state in _TRANSITIONAL_STATES:
+            active_state = self.wait_for_settled_state(active_state)
 
         # If the unit is not active, reset the failure count to prevent previous failures from causing a chain reset
-        if active_state != "active":
+        if active_state != ActiveState.ACTIVE:
             self._consecutive_failures = 0
             self._proc_responded_after_start = False
+            self._startup_polls = 0
+            self._current_interval = interval
 
         match active_state:
-            case "maintenance":
-                self._log("Unit is in maintenance; refusing restart:",
-                          self.systemd_unit)
-            case "inactive":
-                self._log(
+            case ActiveState.MAINTENANCE:
+                log("Unit is in maintenance; refusing restart:",
+                    self.systemd_unit)
+            case ActiveState.INACTIVE:
+                log(
                     "Unit is inactive, but not failed; refusing restart:",
                     self.systemd_unit)
-            case "failed":
-                self._log("Unit has failed; restart handled by systemd:",
-                          self.systemd_unit)
-            case "active":
+            case ActiveState.FAILED:
+                log("Unit has failed; restart handled by systemd:",
+                    self.systemd_unit)
+            case ActiveState.ACTIVE:
                 # Unit is active -> perform A2S query
                 try:
-                    info = a2s.info((self.server_host, self.port),
-                                    timeout=self.timeout)
-                    self._log(
+                    info = self.query_server()
+                    log(
                         "OK", f"{self.server_host}:{self.port}",
                         f"players: {info.player_count}/{info.max_players}",
                         f"map: {info.map_name}")
                     self._consecutive_failures = 0
                     self._proc_responded_after_start = True
+                    if info.player_count == 0:
+                        # Nobody is playing, so there's no need to check as often
+                        # (never below interval, the last wait may have been shortened for start up)
+                        self._current_interval = min(
+                            interval * _IDLE_INTERVAL_MAX_FACTOR,
+                            max(interval,
+                                self._current_interval * _IDLE_INTERVAL_GROWTH))
+                    else:
+                        self._current_interval = interval
                 except Exception as e:
-                    if self._proc_responded_after_start:
+                    if not self._proc_responded_after_start:
+                        # Still starting up, which has to be waited for instead of counted as a failure
+                        self._back_off_startup_interval()
+                    else:
+                        self._current_interval = interval
                         self._consecutive_failures += 1
-                        self._log(
+                        log(
                             "ERROR querying server:",
                             f"{self.server_host}:{self.port}", str(e),
                             f"(consecutive failures={self._consecutive_failures})"
@@ -361,11 +956,20 @@ class Monitor:
 
                         # If we've reached the failure threshold, try to restart the unit.
                         if self._consecutive_failures >= self.failure_threshold:
-                            self._log(
+                            log(
                                 f"Failure threshold reached ({self._consecutive_failures} >= {self.failure_threshold})"
                             )
                             self.attempt_restart()
 
+    def _idle(self, seconds: float) -> None:
+        """Wait for seconds, handling D-Bus signals as they arrive if GLib is available."""
+        if not _HAVE_GLIB:
+            time.sleep(seconds)
+            return
+        loop = GLib.MainLoop()
+        GLib.timeout_add(int(seconds * 1000), loop.quit)
+        loop.run()
+
     def run(self) -> None:
         """SRCDS monitor main loop."""
         self._log(
@@ -373,10 +977,19 @@ class Monitor:
             f"{self.server_host}:{self.port}",
             f"every {self.interval}s; will restart unit {self.systemd_unit} after {self.failure_threshold} failures",
         )
+        if _UNIT_CONTROL == "systemctl":
+            self._log(
+                "Neither python-dbus nor jeepney is installed; controlling unit via systemctl"
+            )
+        else:
+            self._log("Controlling unit via", _UNIT_CONTROL)
         try:
             while True:
                 self.check_server()
-                time.sleep(self.interval)
+                # random is seeded from os.urandom on import, so every process gets its own jitter
+                self._idle(self._current_interval *
+                           random.uniform(1 - _INTERVAL_JITTER,
+                                          1 + _INTERVAL_JITTER))
         except KeyboardInterrupt:
             self._log("Interrupted by user, exiting")
             sys.exit(0)
@@ -389,11 +1002,10 @@ def parse_args() -> argparse.Namespace:
         "SRCDS monitor that restarts/starts a systemd unit when the server is down."
     )
     # rename host -> server-host for clarity; fallback to env SERVER_HOST, otherwise current hostname
-    p.add_argument(
-        "--server-host",
-        help="SRCDS host/IP (or set SERVER_HOST env)",
-        default=os.getenv("SERVER_HOST", socket.gethostname())
-    )
+    # The hostname fallback is filled in by main, so that it's only looked up when actually needed
+    p.add_argument("--server-host",
+                   help="SRCDS host/IP (or set SERVER_HOST env)",
+                   default=os.getenv("SERVER_HOST"))
     p.add_argument("--port",
                    type=int,
                    help="SRCDS query port",
@@ -436,6 +1048,12 @@ def main() -> None:
     """Main routine."""
     args = parse_args()
 
+    # Under systemd stdout is a pipe and thus block buffered, which would hold back log lines
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(line_buffering=True)
+
+    if args.server_host is None:
+        args.server_host = socket.gethostname()
     if not args.server_host:
         print(
             "Error: --server-host must be provided (or set SERVER_HOST env in systemd EnvironmentFile).",
@@ -455,20 +1073,20 @@ def main() -> None:
         sys.exit(2)
 
     try:
-        monitor = Monitor(server_host=args.server_host,
-                          port=args.port,
-                          systemd_unit=args.systemd_unit,
-                          interval=args.interval,
-                          timeout=args.timeout,
-                          failure_threshold=args.failure_threshold,
-                          restart_cooldown=args.restart_cooldown,
-                          max_restarts_per_hour=args.max_restarts_per_hour,
-                          unit_scope=unit_scope_enum)
+        config = MonitorConfig(server_host=args.server_host,
+                               port=args.port,
+                               systemd_unit=args.systemd_unit,
+                               interval=args.interval,
+                               timeout=args.timeout,
+                               failure_threshold=args.failure_threshold,
+                               restart_cooldown=args.restart_cooldown,
+                               max_restarts_per_hour=args.max_restarts_per_hour,
+                               unit_scope=unit_scope_enum)
     except ValueError as ve:
         print(f"Configuration error: {ve}", file=sys.stderr)
         sys.exit(2)
 
-    monitor.run()
+    Monitor(config).run()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import os
 import pathlib
 import shutil
+import stat
 import sys
 import vdf
-from typing import Any, List
+from types import TracebackType
+from typing import Any, Callable, List, Optional, Type
 
 
 class WorkshopCacheException(Exception):
@@ -15,20 +19,47 @@ class WorkshopCacheEmpty(WorkshopCacheException):
     """Workshop cache is not initialised."""
 
 
+def _check_path(path: pathlib.Path, is_type: Callable[[int], bool],
+                exc_type: Type[Exception], message: str) -> None:
+    """Raise exc_type unless path exists and its mode satisfies is_type, using a single stat."""
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise exc_type(message) from None
+    if not is_type(st.st_mode):
+        raise exc_type(message)
+
+
+def _check_dir(path: pathlib.Path, exc_type: Type[Exception],
+               message: str) -> None:
+    """Raise exc_type unless path is an existing directory."""
+    _check_path(path, stat.S_ISDIR, exc_type, message)
+
+
+def _check_file(path: pathlib.Path, exc_type: Type[Exception],
+                message: str) -> None:
+    """Raise exc_type unless path is an existing regular file."""
+    _check_path(path, stat.S_ISREG, exc_type, message)
+
+
 class WorkshopCache:
     """Workshop cache for a given application."""
 
     def __init__(self, base_path: pathlib.Path) -> None:
         """Initialise the workshop cache for a path."""
         self._vdf = None
+        # Raw ACF contents, only parsed into _vdf once it's actually needed
+        self._vdf_text: Optional[str] = None
+        # Whether the VDF has changes that haven't been written out yet
+        self._dirty = False
 
-        if not base_path.is_dir() or not base_path.exists():
-            raise WorkshopCacheException("specified path does not exist.")
+        _check_dir(base_path, WorkshopCacheException,
+                   "specified path does not exist.")
 
         appid_path = base_path / 'steam_appid.txt'
 
-        if appid_path.is_dir() or not appid_path.exists():
-            raise WorkshopCacheException("steam_appid.txt does not exist.")
+        _check_file(appid_path, WorkshopCacheException,
+                    "steam_appid.txt does not exist.")
 
         with open(appid_path, 'r') as appid_file:
             self._appid = int(appid_file.readline().rstrip())
@@ -37,66 +68,119 @@ class WorkshopCache:
             raise ValueError("appid must be an integer larger 0.")
 
         self._cache_path = base_path / 'steamapps' / 'workshop'
-        if not self._cache_path.is_dir() or not self._cache_path.exists():
-            raise WorkshopCacheEmpty("Workshop cache folder does not exist.")
+        _check_dir(self._cache_path, WorkshopCacheEmpty,
+                   "Workshop cache folder does not exist.")
 
         self._content_path = self._cache_path / 'content' / str(self._appid)
-        if not self._content_path.is_dir() or not self._content_path.exists():
-            raise WorkshopCacheEmpty("Workshop content folder does not exist.")
+        _check_dir(self._content_path, WorkshopCacheEmpty,
+                   "Workshop content folder does not exist.")
 
         self._vdf_path = self._cache_path / f'appworkshop_{self._appid}.acf'
-        if self._vdf_path.is_dir() or not self._vdf_path.exists():
-            raise WorkshopCacheEmpty("Workshop ACF does not exist.")
+        _check_file(self._vdf_path, WorkshopCacheEmpty,
+                    "Workshop ACF does not exist.")
         with open(self._vdf_path, 'r') as vdf_file:
-            self._vdf = vdf.load(vdf_file, mapper=vdf.VDFDict)
+            self._vdf_text = vdf_file.read()
+
+    def __enter__(self) -> 'WorkshopCache':
+        """Enter the context, unwritten changes are written out on a clean exit."""
+        return self
 
-    def __del__(self) -> None:
-        """Write out the VDF on destruction."""
-        if self._vdf is not None:
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        """Write out unwritten VDF changes unless the context is left by an exception."""
+        if exc_type is None and self._dirty:
             self.write()
 
     def _get_main(self) -> Any:
-        """Retrieve the main key of the VDF."""
+        """Retrieve the main key of the VDF, parsing the ACF on first use."""
+        if self._vdf is None:
+            self._vdf = vdf.loads(self._vdf_text, mapper=vdf.VDFDict)
+            self._vdf_text = None
         return self._vdf['AppWorkshop']
 
-    def _adjust_size_on_disk(self, size_adjustment) -> None:
-        """Adjust the on disk size of the VDF."""
-        old_size = int(self._get_main()['SizeOnDisk'])
-        self._get_main()[(0, 'SizeOnDisk')] = old_size + size_adjustment
+    def _may_be_installed(self, item_id: str) -> bool:
+        """Cheaply check whether item_id may be installed, without parsing the ACF."""
+        # Every installed item appears as a quoted key in the ACF
+        return self._vdf_text is None or f'"{item_id}"' in self._vdf_text
 
     def remove_item(self, item_id: int) -> None:
         """Remove a single item_id from the workshop cache."""
-        try:
-            item_size = int(self._get_main()['WorkshopItemsInstalled'][str(
-                item_id)]['size'])
-        except KeyError:
-            # Item isn't installed, so there's nothing to do
+        self.remove_items([item_id])
+
+    def remove_items(self, item_ids: List[int]) -> None:
+        """Remove a list of item_ids from the workshop cache."""
+        # Usually none of the items are installed, which doesn't require parsing the ACF at all
+        candidates = [
+            item_id for item_id in dict.fromkeys(str(i) for i in item_ids)
+            if self._may_be_installed(item_id)
+        ]
+        if not candidates:
             return
 
-        print(f"Workshop: removing {item_id} of size {item_size}")
+        main = self._get_main()
+        installed = main['WorkshopItemsInstalled']
+        details = main['WorkshopItemDetails']
+
+        # Determine everything to remove before touching the VDF or the disk
+        to_remove = []
+        total_size = 0
+        for item_id in candidates:
+            try:
+                item_size = int(installed[item_id]['size'])
+            except KeyError:
+                # Item isn't installed, so there's nothing to do
+                continue
+
+            item_path = self._content_path / item_id
+            _check_dir(item_path, WorkshopCacheException,
+                       "Workshop item exists in ACF but not on disk.")
+
+            print(f"Workshop: removing {item_id} of size {item_size}")
+            to_remove.append(item_id)
+            total_size += item_size
+
+        if not to_remove:
+            return
 
         # We don't ignore any further KeyError exceptions now
         # If any occur, the VDF file is inconsistent
-        self._adjust_size_on_disk(-item_size)
-        self._get_main()['WorkshopItemsInstalled'].remove_all_for(str(item_id))
-        self._get_main()['WorkshopItemDetails'].remove_all_for(str(item_id))
-
-        item_path = self._content_path / str(item_id)
-        if not item_path.is_dir() or not item_path.exists():
-            raise WorkshopCacheException(
-                "Workshop item exists in ACF but not on disk.")
-
-        shutil.rmtree(item_path)
-
-    def remove_items(self, item_ids: List[int]) -> None:
-        """Remove a list of item_ids from the workshop cache."""
-        for id in item_ids:
-            self.remove_item(id)
+        self._dirty = True
+        main[(0, 'SizeOnDisk')] = int(main['SizeOnDisk']) - total_size
+        for item_id in to_remove:
+            installed.remove_all_for(item_id)
+            details.remove_all_for(item_id)
+
+        # Persist the VDF first, so it never references already deleted items
+        self.write()
+
+        # Deleting is I/O bound, so use a thread per CPU to keep the disk queue full
+        # shutil.rmtree already walks with os.scandir on directory fds and doesn't follow symlinks
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(to_remove))) as executor:
+            # Consume the results to re-raise any error of the removals
+            list(
+                executor.map(shutil.rmtree,
+                             (self._content_path / item_id
+                              for item_id in to_remove)))
 
     def write(self) -> None:
         """Write out the modified VDF file."""
-        with open(self._vdf_path, 'w') as vdf_file:
-            vdf.dump(self._vdf, vdf_file, pretty=True)
+        # The ACF may not have been parsed yet, so ensure there's a VDF to dump
+        self._get_main()
+        # Write to a temporary file and move it into place, so that the ACF is never left truncated
+        tmp_path = self._vdf_path.with_suffix('.acf.tmp')
+        try:
+            with open(tmp_path, 'w') as vdf_file:
+                vdf.dump(self._vdf, vdf_file, pretty=True)
+                vdf_file.flush()
+                os.fsync(vdf_file.fileno())
+            shutil.copymode(self._vdf_path, tmp_path)
+            os.replace(tmp_path, self._vdf_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._dirty = False
 
 
 def parse_args() -> argparse.Namespace:
@@ -125,8 +209,8 @@ def main() -> None:
     args = parse_args()
 
     try:
-        wscache = WorkshopCache(args.path)
-        wscache.remove_items(args.item)
+        with WorkshopCache(args.path) as wscache:
+            wscache.remove_items(args.item)
     except WorkshopCacheEmpty as wce:
         print("skipped: " + str(wce))
     except Exception as e: